@@ -2,17 +2,24 @@
 import os
 import subprocess
 import sys
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
-import toml
+
+try:
+    import tomllib
+except ImportError:  # python < 3.11
+    import tomli as tomllib
 
 
 """
 A super disgusting way to test the packages install on WINDOWS ONLY. 
 I wrote this when I first learned python, but it works so I kepe it around for the lols.
 """
-def retrieve_details(path) -> tuple[str, str, list[str]]:
+@lru_cache(maxsize=None)
+def retrieve_details(path) -> tuple[str, str, tuple[str, ...]]:
     """
     Get the package details
 
@@ -20,40 +27,40 @@ def retrieve_details(path) -> tuple[str, str, list[str]]:
     :returns: The name, version, and dependencies of the package
     """
     
-    details = toml.load(path).get("project")
+    with open(path, "rb") as file:
+        details = tomllib.load(file).get("project")
     name = details.get("name")
     version = details.get("version")
-    dependencies = details.get("dependencies")
+    dependencies = tuple(details.get("dependencies", ()))
     return name, version, dependencies
 
 
-def retrieve_project_directory(path) -> Path:
+def retrieve_project_directory(path: Path) -> Path:
     """
     Retrieves the project's directory
 
     :param path: Child path to project directory
     :returns: The path to the project's directory
     """
-    return Path(path).parent
+    return path.parent
 
 
-def retrieve_project_file() -> os.PathLike:
+def retrieve_project_file() -> Path:
     """
-    Retrieves the project file (pyproject.toml)
+    Retrieves the project file (pyproject.toml) from the working directory or the closest ancestor containing one
 
     :returns: The project file
     :raises FileNotFoundError: if not found
     """
-    
-    project_file = os.path.join(os.getcwd(), "pyproject.toml")
-    if not os.path.exists(project_file):
-        project_file = os.path.join(Path(os.getcwd()).parent, "pyproject.toml")
-    if not os.path.exists(project_file):
-        raise FileNotFoundError("Can't find project file")
-    return project_file
+    cwd = Path.cwd()
+    for directory in (cwd, *cwd.parents):
+        project_file = directory / "pyproject.toml"
+        if project_file.is_file():
+            return project_file
+    raise FileNotFoundError("Can't find project file")
 
 
-def collect_project() -> tuple[Path, os.PathLike, str, str, list[str]]:
+def collect_project() -> tuple[Path, Path, str, str, tuple[str, ...]]:
     """
     Collects the project
 
@@ -65,18 +72,23 @@ def collect_project() -> tuple[Path, os.PathLike, str, str, list[str]]:
     return project_directory, project_file, package_name, package_version, package_dependencies
 
 
-# get project information and work from correct directory
-proj_dir, proj_file, pkg_name, pkg_version, pkg_dependencies = collect_project()
-os.chdir(proj_dir)
-
-print(f"\nInstalling: {pkg_name}=={pkg_version}, from {proj_file} in {proj_dir}")
-print(f"Package dependencies: {pkg_dependencies}")
-
+@pytest.fixture(scope="session")
+def project() -> Iterator[tuple[Path, Path, str, str, tuple[str, ...]]]:
+    """
+    Collects the project and works from its directory, restoring the original working directory afterwards
 
-@pytest.mark.parametrize("path", [proj_dir])
-def test_install(path):
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-e ."])
-    except subprocess.CalledProcessError as e:
-        print(f"{e.output}")
-        # This doesn't work on non-windows systems
+    :yields: The project details (directory, file, name, version, dependencies)
+    """
+    proj_dir, proj_file, pkg_name, pkg_version, pkg_dependencies = details = collect_project()
+    print(f"\nInstalling: {pkg_name}=={pkg_version}, from {proj_file} in {proj_dir}")
+    print(f"Package dependencies: {pkg_dependencies}")
+    original_directory = os.getcwd()
+    os.chdir(proj_dir)
+    yield details
+    os.chdir(original_directory)
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="Install smoke test is Windows-only")
+@pytest.mark.usefixtures("project")
+def test_install():
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "-e", "."])